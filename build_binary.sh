@@ -0,0 +1,9 @@
+#!/usr/bin/env sh
+# Build a single-file native executable with Nuitka (Python -> C -> binary), so
+# launching the converter skips interpreter startup and the tkinter import.
+# Needs: pip install nuitka, plus a C compiler (Nuitka offers to fetch one on Windows).
+set -e
+cd "$(dirname "$0")"
+python3 -m nuitka --standalone --onefile --enable-plugin=tk-inter \
+    --output-dir=build --output-filename=ppt-mp4-converter \
+    mp4_converter.py
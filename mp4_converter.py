@@ -6,6 +6,7 @@ PPT-Compatible MP4 Converter Pro (GUI, Aesthetic + Speed Control)
 - Audio: AAC 128k, 48kHz, stereo; adds silent track if missing
 - Speed: presets (0.5x .. 4x) + custom; audio tempo preserved
 - Profiles: Most Compatible (Baseline), Balanced (Main), High (High)
+- Inputs already matching the target spec are remuxed (stream copy), not re-encoded
 """
 
 import os
@@ -16,34 +17,241 @@ import subprocess
 import threading
 import queue
 import math
+import asyncio
+import functools
+from collections import deque
+import tkinter as tk
 from tkinter import Tk, filedialog, StringVar, BooleanVar, N, S, E, W, messagebox
 from tkinter import ttk
 
+CPU_COUNT = os.cpu_count() or 1
+# x264 scales poorly past ~8 threads, so spread larger machines over parallel jobs
+DEFAULT_THREADS = min(8, CPU_COUNT)
+DEFAULT_JOBS = max(1, CPU_COUNT // DEFAULT_THREADS)
+
 # ----------------------- Utilities -----------------------
 
+# Resolved once: PATH walks are slow on Windows, and absolute paths skip the lookup on every spawn
+_FFMPEG = shutil.which("ffmpeg")
+_FFPROBE = shutil.which("ffprobe")
+HAS_FFMPEG = bool(_FFMPEG and _FFPROBE)
+FFMPEG = _FFMPEG or "ffmpeg"
+FFPROBE = _FFPROBE or "ffprobe"
+
 def which_ffmpeg() -> bool:
-    return shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+    return HAS_FFMPEG
 
-def run_cmd(cmd):
-    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    out, err = proc.communicate()
-    return proc.returncode, out, err
+def run_cmd(cmd, err_tail=40):
+    """
+    Run a command while streaming stderr instead of buffering all of it; only the
+    last err_tail lines are kept. Returns (returncode, stdout, stderr tail).
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1)
+
+    tail = deque(maxlen=err_tail)
+    def pump_stderr():
+        for line in proc.stderr:
+            tail.append(line.rstrip())
+    reader = threading.Thread(target=pump_stderr, daemon=True)
+    reader.start()
+
+    out = proc.stdout.read()
+    proc.wait()
+    reader.join()
+    return proc.returncode, out, "\n".join(tail)
+
+def _parse_progress(line, on_progress):
+    key, _, val = line.strip().partition("=")
+    # out_time_ms is misnamed upstream: both keys are microseconds
+    if key in ("out_time_us", "out_time_ms") and val.isdigit():
+        on_progress(int(val) / 1_000_000)
+
+async def run_cmd_async(cmd, on_progress=None, err_tail=40):
+    """
+    Run an ffmpeg command from the worker's event loop; both pipes are drained by
+    coroutines. '-nostats' is always added (no '\r' stats lines); with on_progress,
+    '-progress pipe:1' reports the output position in seconds.
+    Returns (returncode, stdout, stderr tail).
+    """
+    extra = ["-progress", "pipe:1", "-nostats"] if on_progress is not None else ["-nostats"]
+    cmd = [cmd[0], *extra, *cmd[1:]]
+    proc = await asyncio.create_subprocess_exec(*cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    tail = deque(maxlen=err_tail)
+    out = []
+    async def pump_stderr():
+        # Chunked, not readline(): no line-length limit, and '\r' counts as a break too
+        pending = ""
+        while chunk := await proc.stderr.read(65536):
+            lines = (pending + chunk.decode(errors="replace")).replace("\r", "\n").split("\n")
+            pending = lines.pop()
+            tail.extend(line for line in lines if line.strip())
+        if pending.strip():
+            tail.append(pending)
+    async def pump_stdout():
+        async for line in proc.stdout:
+            line = line.decode(errors="replace")
+            if on_progress is None:
+                out.append(line)
+            else:
+                _parse_progress(line, on_progress)
 
-def has_audio_stream(path: str) -> bool:
-    cmd = ["ffprobe", "-v", "error", "-select_streams", "a", "-show_entries", "stream=codec_type", "-of", "json", path]
+    try:
+        await asyncio.gather(pump_stderr(), pump_stdout())
+        await proc.wait()
+    finally:
+        if proc.returncode is None:
+            # Never leave an ffmpeg behind with nobody draining its pipes
+            proc.kill()
+            await proc.wait()
+    return proc.returncode, "".join(out), "\n".join(tail)
+
+@functools.lru_cache(maxsize=1)
+def _load_av():
+    """
+    PyAV (optional): probe in-process via libavformat instead of spawning ffprobe.
+    Imported on the first probe rather than at startup; None (cached) when missing.
+    """
+    try:
+        import av
+    except ImportError:
+        return None
+    return av
+
+def _probe_av(av, path: str) -> dict:
+    """probe_media() via PyAV; same shape as the ffprobe result."""
+    info = {"video": None, "audio": None, "duration": None}
+    with av.open(path) as container:
+        for st in container.streams:
+            cc = st.codec_context
+            if st.type == "video" and info["video"] is None:
+                info["video"] = {
+                    "codec_type": "video",
+                    "codec_name": cc.name,
+                    "profile": cc.profile or "",
+                    "level": getattr(cc, "level", None) or 0,
+                    "pix_fmt": cc.pix_fmt or "",
+                    "r_frame_rate": str(st.base_rate or 0),
+                    "avg_frame_rate": str(st.average_rate or 0),
+                    "width": cc.width,
+                    "bit_rate": cc.bit_rate or 0,
+                    "height": cc.height,
+                }
+            elif st.type == "audio" and info["audio"] is None:
+                info["audio"] = {
+                    "codec_type": "audio",
+                    "codec_name": cc.name,
+                    "sample_rate": cc.sample_rate,
+                    "channels": cc.channels,
+                }
+        if container.duration:
+            info["duration"] = container.duration / 1_000_000  # AV_TIME_BASE
+    return info
+
+def probe_media(path: str) -> dict:
+    """
+    Single probe per input: first video stream, first audio stream and
+    container duration. Anything missing or unreadable comes back as None.
+    In-process through PyAV when installed; otherwise one ffprobe call using its
+    flat 'key=value' output (values kept as strings) rather than JSON.
+    """
+    av = _load_av()
+    if av is not None:
+        try:
+            return _probe_av(av, path)
+        except Exception:
+            pass  # fall back to ffprobe, which may know formats this PyAV build doesn't
+    info = {"video": None, "audio": None, "duration": None}
+    cmd = [
+        FFPROBE, "-v", "error",
+        "-show_entries",
+        "stream=codec_type,codec_name,profile,level,pix_fmt,r_frame_rate,avg_frame_rate,"
+        "width,height,bit_rate,sample_rate,channels:format=duration",
+        "-of", "flat", path,
+    ]
     code, out, _ = run_cmd(cmd)
     if code != 0:
-        return False
+        return info
+    # streams.stream.0.codec_type="video" / format.duration="12.345000"
+    streams, fmt = {}, {}
+    for line in out.splitlines():
+        key, sep, val = line.partition("=")
+        if not sep:
+            continue
+        parts = key.split(".")
+        val = val.strip('"')
+        if len(parts) == 4 and parts[0] == "streams":
+            streams.setdefault(parts[2], {})[parts[3]] = val
+        elif len(parts) == 2 and parts[0] == "format":
+            fmt[parts[1]] = val
+    for s in streams.values():
+        kind = s.get("codec_type")
+        if kind in ("video", "audio") and info[kind] is None:
+            info[kind] = s
     try:
-        data = json.loads(out)
-        streams = data.get("streams", [])
-        return any(s.get("codec_type") == "audio" for s in streams)
-    except Exception:
-        return False
+        info["duration"] = float(fmt.get("duration"))
+    except (TypeError, ValueError):
+        pass
+    return info
 
-def ensure_even_dimensions_filter():
-    # Ensure H.264-safe dimensions and constant 30 fps
-    return "scale=trunc(iw/2)*2:trunc(ih/2)*2,fps=30"
+def parse_rate(rate) -> float:
+    """ffprobe rational ('30000/1001') -> float; 0.0 when unknown."""
+    try:
+        num, _, den = str(rate).partition("/")
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+def cfr_rate(video) -> float:
+    """Frame rate of a constant-rate stream (r_frame_rate == avg_frame_rate); 0.0 otherwise."""
+    if not video:
+        return 0.0
+    fps = parse_rate(video.get("r_frame_rate"))
+    return fps if math.isclose(fps, parse_rate(video.get("avg_frame_rate")), rel_tol=1e-3) else 0.0
+
+def parse_bitrate(value) -> int:
+    """'6M' / '800k' / '6000000' -> bits per second; 0 when unknown ('N/A', missing)."""
+    text = str(value).strip().upper()
+    scale = {"K": 1_000, "M": 1_000_000}.get(text[-1:], 1)
+    try:
+        return int(float(text.rstrip("KM")) * scale)
+    except ValueError:
+        return 0
+
+def is_ppt_compatible(info: dict, profile_cfg) -> bool:
+    """True when the probed input already meets the target spec and only needs a remux."""
+    v, a = info["video"], info["audio"]
+    if not v or not a:
+        return False
+    fps = cfr_rate(v)
+    profile = str(v.get("profile", "")).lower().replace("constrained ", "")
+    return (
+        v.get("codec_name") == "h264"
+        and v.get("pix_fmt") == "yuv420p"
+        and profile == profile_cfg["profile"]
+        and 0 < int(v.get("level", 0)) <= round(float(profile_cfg["level"]) * 10)
+        and int(v.get("width", 1)) % 2 == 0
+        and int(v.get("height", 1)) % 2 == 0
+        and 0 < fps <= 30.001
+        # Same ceiling as re-encodes get; unknown bitrate means re-encode to be safe
+        and 0 < parse_bitrate(v.get("bit_rate")) <= parse_bitrate(profile_cfg["maxrate"])
+        and a.get("codec_name") == "aac"
+        and str(a.get("sample_rate")) == "48000"
+        and int(a.get("channels", 0)) == 2
+    )
+
+def ensure_even_dimensions_filter(width=None, height=None, fps=None):
+    """
+    Ensure H.264-safe dimensions and constant 30 fps, skipping the steps a probed
+    input already satisfies (unknown values keep the step). The scale only trims at
+    most one pixel, so cheap bilinear is plenty; fps does the CFR conversion on its own.
+    """
+    parts = []
+    if not (width and height and width % 2 == 0 and height % 2 == 0):
+        parts.append("scale=trunc(iw/2)*2:trunc(ih/2)*2:flags=bilinear")
+    if not (fps and math.isclose(fps, 30.0, rel_tol=1e-4)):
+        parts.append("fps=fps=30:round=near")
+    return ",".join(parts)
 
 def build_atempo_expr(speed: float) -> str:
     """
@@ -70,14 +278,181 @@ def build_atempo_expr(speed: float) -> str:
 
     return ",".join(f"atempo={f}" for f in factors) if factors else "atempo=1.0"
 
+LOUDNORM_TARGET = "I=-16:TP=-1.5:LRA=11"
+
+# First-pass key -> the range loudnorm accepts for the matching second-pass option
+LOUDNORM_MEASURED_RANGES = {
+    "input_i": (-99.0, 0.0),
+    "input_tp": (-99.0, 99.0),
+    "input_lra": (0.0, 99.0),
+    "input_thresh": (-99.0, 0.0),
+    "target_offset": (-99.0, 99.0),
+}
+
+def valid_loudness(measured):
+    """
+    float() every first-pass field; None unless all are finite and inside loudnorm's ranges
+    (silent input reports '-inf', which loudnorm rejects as a measured_* value).
+    """
+    if not measured:
+        return None
+    values = {}
+    for key, (lo, hi) in LOUDNORM_MEASURED_RANGES.items():
+        try:
+            val = float(measured[key])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not (math.isfinite(val) and lo <= val <= hi):
+            return None
+        values[key] = val
+    return values
+
+def loudness_filter(fast=True, measured=None) -> str:
+    """
+    fast: dynaudnorm, a fraction of loudnorm's cost.
+    Otherwise EBU R128 loudnorm; linear second pass when valid first-pass measurements
+    exist, single pass if not.
+    """
+    if fast:
+        return "dynaudnorm=f=150:g=15:p=0.7"
+    measured = valid_loudness(measured)
+    if measured:
+        return (
+            f"loudnorm={LOUDNORM_TARGET}"
+            f":measured_I={measured['input_i']}:measured_TP={measured['input_tp']}"
+            f":measured_LRA={measured['input_lra']}:measured_thresh={measured['input_thresh']}"
+            f":offset={measured['target_offset']}:linear=true"
+        )
+    return f"loudnorm={LOUDNORM_TARGET}"
+
+def parse_timestamp(text: str):
+    """'SS', 'MM:SS' or 'HH:MM:SS[.ms]' -> seconds; None when blank, ValueError when malformed."""
+    text = text.strip()
+    if not text:
+        return None
+    parts = [float(p) for p in text.split(":")]
+    if len(parts) > 3:
+        raise ValueError(text)
+    for i, part in enumerate(parts):
+        # No negatives/nan/inf anywhere; minutes and seconds below a higher field stay < 60
+        if not math.isfinite(part) or part < 0 or (i > 0 and part >= 60):
+            raise ValueError(text)
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + part
+    return seconds
+
+def trim_args(start=None, end=None):
+    """Input-side -ss/-to: keyframe seek in the demuxer, so skipped parts are never decoded."""
+    args = []
+    if start:
+        args += ["-ss", f"{start:.3f}"]
+    if end:
+        args += ["-to", f"{end:.3f}"]
+    return args
+
+def measure_loudness(path: str, start=None, end=None):
+    """First loudnorm pass (analysis only); returns the validated measurements or None."""
+    cmd = [
+        FFMPEG, "-hide_banner", "-nostats",
+        *trim_args(start, end), "-i", path, "-vn",
+        "-af", f"loudnorm={LOUDNORM_TARGET}:print_format=json",
+        "-f", "null", "-",
+    ]
+    code, _, err = run_cmd(cmd)
+    if code != 0:
+        return None
+    try:
+        return valid_loudness(json.loads(err[err.rindex("{"):err.rindex("}") + 1]))
+    except ValueError:
+        return None
+
+@functools.lru_cache(maxsize=1024)
+def _sample_motion(path: str, mtime_ns: int, start=None) -> float:
+    """Mean scene-change score over the first seconds, on a tiny downscale; -1.0 on failure."""
+    cmd = [
+        FFMPEG, "-hide_banner", "-nostats",
+        *trim_args(start), "-t", "2", "-i", path, "-an",
+        "-vf", "scale=160:-2,select='gte(scene,0)',metadata=print:key=lavfi.scene_score",
+        "-f", "null", "-",
+    ]
+    code, _, err = run_cmd(cmd, err_tail=1000)
+    scores = [float(line.rsplit("=", 1)[1]) for line in err.splitlines() if "lavfi.scene_score=" in line]
+    if code != 0 or not scores:
+        return -1.0
+    return sum(scores) / len(scores)
+
+def detect_content_type(path: str, start=None) -> str:
+    """Auto content type: near-static frames => screen recording, anything else => motion."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return "Motion (camera)"
+    motion = _sample_motion(path, mtime_ns, start)
+    return "Screen recording" if 0 <= motion < 0.01 else "Motion (camera)"
+
 PROFILES = {
-    "Most Compatible (Baseline L3.1, 30fps)": {"profile": "baseline", "level": "3.1", "preset": "veryfast", "crf": "20"},
-    "Balanced (Main L4.0, 30fps)":             {"profile": "main",     "level": "4.0", "preset": "faster",   "crf": "20"},
-    "High Quality (High L4.1, 30fps)":         {"profile": "high",     "level": "4.1", "preset": "fast",     "crf": "18"},
+    "Most Compatible (Baseline L3.1, 30fps)": {"profile": "baseline", "level": "3.1", "preset": "veryfast", "crf": "20",
+                                               "maxrate": "6M", "bufsize": "12M"},
+    "Balanced (Main L4.0, 30fps)":             {"profile": "main",     "level": "4.0", "preset": "faster",   "crf": "20",
+                                               "maxrate": "8M", "bufsize": "16M"},
+    "High Quality (High L4.1, 30fps)":         {"profile": "high",     "level": "4.1", "preset": "fast",     "crf": "18",
+                                               "maxrate": "8M", "bufsize": "16M"},
+}
+
+# H.264 encoders in order of preference for the GUI; libx264 is always the fallback
+H264_ENCODERS = ["libx264", "h264_nvenc", "h264_qsv", "h264_vaapi", "h264_videotoolbox"]
+VAAPI_DEVICE = "/dev/dri/renderD128"
+
+def ffmpeg_component_names(kind: str) -> set:
+    """Names from 'ffmpeg -encoders' / '-filters' (second column); empty on failure."""
+    try:
+        code, out, _ = run_cmd([FFMPEG, "-hide_banner", f"-{kind}"])
+    except OSError:
+        return set()
+    if code != 0:
+        return set()
+    return {line.split()[1] for line in out.splitlines() if len(line.split()) > 1}
+
+def detect_h264_encoders():
+    """Ask ffmpeg once which of H264_ENCODERS this build provides."""
+    names = ffmpeg_component_names("encoders")
+    return [e for e in H264_ENCODERS if e in names] or ["libx264"]
+
+# Single-filter, pitch-preserving tempo changes; set by detect_tempo_filters() at startup
+_HAS_RUBBERBAND = False
+_HAS_ASCALE = False
+
+def detect_tempo_filters():
+    global _HAS_RUBBERBAND, _HAS_ASCALE
+    names = ffmpeg_component_names("filters")
+    _HAS_RUBBERBAND = "rubberband" in names
+    _HAS_ASCALE = "ascale" in names
+
+# x264 -tune per content type; "Auto" samples the input (see detect_content_type)
+CONTENT_TYPES = {
+    "Auto": None,
+    "Motion (camera)": "fastdecode",
+    "Screen recording": "stillimage,fastdecode",
+    "Still images": "stillimage",
 }
 
 SPEED_PRESETS = ["0.5x", "0.75x", "1.0x", "1.25x", "1.5x", "2.0x", "2.5x", "3.0x", "4.0x", "Custom…"]
 
+# Preset chains computed once; custom speeds are cached per worker (ConverterWorker.tempo)
+_ATEMPO_CACHE = {float(s.rstrip("x")): build_atempo_expr(float(s.rstrip("x"))) for s in SPEED_PRESETS if s != "Custom…"}
+
+def atempo_chain(speed: float) -> str:
+    return _ATEMPO_CACHE.get(speed) or build_atempo_expr(speed)
+
+def tempo_filter(speed: float) -> str:
+    """Prefer rubberband/ascale (one filter, any factor) over a chained atempo."""
+    if _HAS_RUBBERBAND:
+        return f"rubberband=tempo={speed}"
+    if _HAS_ASCALE:
+        return f"ascale=tempo={speed}"
+    return atempo_chain(speed)
+
 def parse_speed(preset: str, custom: str) -> float:
     if preset == "Custom…":
         try:
@@ -88,47 +463,127 @@ def parse_speed(preset: str, custom: str) -> float:
     else:
         return float(preset.replace("x", ""))
 
+def parse_count(text: str, default: int, minimum: int = 0) -> int:
+    try:
+        return max(minimum, int(str(text).strip()))
+    except Exception:
+        return default
+
 def suggest_output_path(in_path: str, out_dir: str) -> str:
     base = os.path.splitext(os.path.basename(in_path))[0]
     return os.path.join(out_dir, f"{base}_ppt.mp4")
 
+def plan_tasks(files, out_dir):
+    """
+    (input, output) pairs with distinct outputs: same-named inputs from different
+    folders get _2, _3, ... so parallel jobs never write the same file.
+    """
+    tasks, taken = [], set()
+    for f in files:
+        outp = suggest_output_path(f, out_dir)
+        stem, n = outp[:-len(".mp4")], 2
+        # Case-insensitive: Windows/macOS filesystems treat Clip and clip as one file
+        while outp.lower() in taken:
+            outp, n = f"{stem}_{n}.mp4", n + 1
+        taken.add(outp.lower())
+        tasks.append((f, outp))
+    return tasks
+
 # ----------------------- FFmpeg Builder -----------------------
 
-def build_ffmpeg_cmd(inp, outp, profile_cfg, speed=1.0, loud_norm=False, add_silence=False):
+def video_codec_args(encoder, profile_cfg):
+    """
+    Per-encoder pieces of the command: (input args, extra vf steps, codec args).
+    Filters always run on the CPU; hardware encoders only take over the encode.
+    """
+    prof, level = profile_cfg["profile"], profile_cfg["level"]
+    # Same peak cap as libx264; rate-targeting modes aim at half of it
+    cap = ["-maxrate", profile_cfg["maxrate"], "-bufsize", profile_cfg["bufsize"]]
+    target = f"{parse_bitrate(profile_cfg['maxrate']) // 2000}k"
+    if encoder == "h264_nvenc":
+        # CUDA decode; frames come back to system memory for the CPU filters
+        return ["-hwaccel", "cuda"], [], [
+            "-c:v", "h264_nvenc", "-preset", "p4", "-rc", "vbr", "-cq", "23", "-b:v", "0", *cap,
+            "-profile:v", prof, "-level", level, "-pix_fmt", "yuv420p",
+        ]
+    if encoder == "h264_qsv":
+        # global_quality plus a maxrate makes ffmpeg pick QVBR instead of uncapped ICQ
+        return [], [], [
+            "-c:v", "h264_qsv", "-preset", "veryfast", "-global_quality", "23", "-b:v", target, *cap,
+            "-profile:v", prof, "-level", str(int(float(level) * 10)), "-pix_fmt", "nv12",
+        ]
+    if encoder == "h264_vaapi":
+        vaapi_prof = "constrained_baseline" if prof == "baseline" else prof
+        return ["-vaapi_device", VAAPI_DEVICE], ["format=nv12", "hwupload"], [
+            "-c:v", "h264_vaapi", "-rc_mode", "VBR", "-b:v", target, *cap,
+            "-profile:v", vaapi_prof, "-level", level,
+        ]
+    if encoder == "h264_videotoolbox":
+        return [], [], [
+            "-c:v", "h264_videotoolbox", "-b:v", profile_cfg["maxrate"], "-profile:v", prof, "-pix_fmt", "yuv420p",
+        ]
+    return [], [], [
+        "-c:v", "libx264",
+        "-profile:v", prof,
+        "-level", level,
+        "-pix_fmt", "yuv420p",
+        "-preset", profile_cfg["preset"],
+        "-crf", profile_cfg["crf"],
+        # Capped CRF: no bitrate spikes PowerPoint chokes on, no second pass
+        "-maxrate", profile_cfg["maxrate"], "-bufsize", profile_cfg["bufsize"],
+        # Baseline has no B-frames anyway; a single reference also cuts motion search
+        *(["-bf", "0", "-refs", "1"] if prof == "baseline" else []),
+    ]
+
+def build_ffmpeg_cmd(inp, outp, profile_cfg, speed=1.0, loud_norm=False, add_silence=False, encoder="libx264", threads=0,
+                     x264_tuning=False, fast_loudness=True, loud_measured=None, width=None, height=None, src_fps=None,
+                     tune=None, start=None, end=None, tempo=None):
     """
     Build a robust ffmpeg command:
-      - Video: libx264 yuv420p, CFR 30, +faststart, setpts for speed
-      - Audio: AAC 128k stereo 48kHz; atempo for speed; loudnorm optional
+      - Video: H.264 yuv420p (libx264 or a hardware encoder), CFR 30, +faststart, setpts for speed
+      - Audio: AAC 128k stereo 48kHz; rubberband/ascale/atempo for speed; dynaudnorm or (two-pass) loudnorm optional
       - Silence: add anullsrc if no audio; 'shortest' to trim trailing silence
+      - tempo: precomputed audio tempo filter (defaults to tempo_filter(speed))
+      - start/end (seconds): seek in the demuxer, before -i
+      - width/height/src_fps (probed; src_fps only for CFR input) let already-even,
+        already-30fps input skip the scale/fps filters, and -vf entirely if nothing is left
     """
+    hw_in, vf_tail, v_args = video_codec_args(encoder, profile_cfg)
+
     # Video filter chain
     vf_parts = []
     # Speed: PTS/speed (faster => divide; slower => multiply)
     if not math.isclose(speed, 1.0, rel_tol=1e-6):
         vf_parts.append(f"setpts=PTS/{speed}")
-    vf_parts.append(ensure_even_dimensions_filter())
-    vf = ",".join(vf_parts)
+    # setpts keeps CFR input CFR, scaled by speed
+    even_fps = ensure_even_dimensions_filter(width, height, src_fps * speed if src_fps else None)
+    if even_fps:
+        vf_parts.append(even_fps)
+    vf_parts += vf_tail
 
-    base = [
-        "ffmpeg", "-y",
-        "-i", inp,
+    base = [FFMPEG, "-y", *hw_in, *trim_args(start, end), "-i", inp]
+    if add_silence:
+        # Silent AAC source; we don't need atempo on silence since -shortest ends at video
+        base += ["-f", "lavfi", "-t", "99999", "-i", "anullsrc=channel_layout=stereo:sample_rate=48000"]
+
+    base += [
         "-map_metadata", "-1",
         "-movflags", "+faststart",
-        "-vsync", "vfr",
-        "-vf", vf,
-        "-r", "30",
-        "-c:v", "libx264",
-        "-profile:v", profile_cfg["profile"],
-        "-level", profile_cfg["level"],
-        "-pix_fmt", "yuv420p",
-        "-preset", profile_cfg["preset"],
-        "-crf", profile_cfg["crf"],
     ]
+    if vf_parts:
+        base += ["-vf", ",".join(vf_parts)]
+    base += v_args
+    if tune and encoder == "libx264":
+        base += ["-tune", tune]
+    if threads > 0:
+        base += ["-threads", str(threads)]
+    if x264_tuning and encoder == "libx264":
+        n = threads or CPU_COUNT
+        # Frame threads only (sliced threads trade efficiency for latency) + parallel lookahead
+        base += ["-x264-params", f"threads={n}:sliced-threads=0:lookahead-threads={max(1, n // 4)}"]
 
     if add_silence:
-        # Add silent AAC track; we don't need atempo on silence since -shortest ends at video
         base += [
-            "-f", "lavfi", "-t", "99999", "-i", "anullsrc=channel_layout=stereo:sample_rate=48000",
             "-shortest",
             "-c:a", "aac", "-b:a", "128k", "-ar", "48000", "-ac", "2",
             "-map", "0:v:0", "-map", "1:a:0",
@@ -137,9 +592,9 @@ def build_ffmpeg_cmd(inp, outp, profile_cfg, speed=1.0, loud_norm=False, add_sil
         # Real audio present: tempo must match video speed
         a_filters = []
         if loud_norm:
-            a_filters.append("loudnorm=I=-16:TP=-1.5:LRA=11")
+            a_filters.append(loudness_filter(fast_loudness, loud_measured))
         if not math.isclose(speed, 1.0, rel_tol=1e-6):
-            a_filters.append(build_atempo_expr(speed))
+            a_filters.append(tempo or tempo_filter(speed))
         if a_filters:
             base += ["-filter:a", ",".join(a_filters)]
         base += ["-c:a", "aac", "-b:a", "128k", "-ar", "48000", "-ac", "2"]
@@ -147,57 +602,158 @@ def build_ffmpeg_cmd(inp, outp, profile_cfg, speed=1.0, loud_norm=False, add_sil
     base.append(outp)
     return base
 
+def build_remux_cmd(inp, outp):
+    """Stream-copy fast path: no decode/encode, just move moov to the front."""
+    return [
+        FFMPEG, "-y",
+        "-i", inp,
+        "-map", "0:v:0", "-map", "0:a:0",
+        "-map_metadata", "-1",
+        "-c", "copy",
+        "-movflags", "+faststart",
+        outp,
+    ]
+
 # ----------------------- Worker -----------------------
 
 class ConverterWorker(threading.Thread):
-    def __init__(self, tasks, profile_name, speed_preset, speed_custom, normalize_audio, overwrite, log_q, progress_cb):
+    """
+    Hosts an asyncio loop (run_tasks) on its own thread. Probing/analysis of upcoming
+    files overlaps with running encodes; at most `jobs` encodes run at once.
+    """
+    def __init__(self, tasks, profile_name, speed_preset, speed_custom, normalize_audio, overwrite, log_q, progress_cb,
+                 encoder="libx264", jobs=1, threads=0, x264_tuning=False, fast_loudness=True,
+                 content_type="Auto", start=None, end=None):
         super().__init__(daemon=True)
         self.tasks = tasks
         self.profile = PROFILES[profile_name]
+        self.encoder = encoder
+        self.jobs = max(1, jobs)
+        # 0 = share all vCPUs evenly between the parallel jobs
+        self.threads = threads or max(1, CPU_COUNT // self.jobs)
+        self.x264_tuning = x264_tuning
         self.speed = parse_speed(speed_preset, speed_custom)
+        # Computed once per batch, so custom speeds don't rebuild the chain per file
+        self.tempo = tempo_filter(self.speed)
         self.normalize_audio = normalize_audio
+        self.fast_loudness = fast_loudness
+        self.content_type = content_type
+        self.trim_start = start
+        self.trim_end = end
         self.overwrite = overwrite
         self.log_q = log_q
         self.progress_cb = progress_cb
+        # Only touched from the event loop thread
+        self._done = 0
+        self._partial = {}  # outp -> fraction of the running conversion
+
+    def report(self, msg):
+        self.progress_cb(self._done + sum(self._partial.values()), len(self.tasks), msg)
+
+    def file_progress(self, outp, duration):
+        if not duration:
+            return None
+        def update(seconds):
+            # Stay below 1.0 so the bar only completes once the file really finished
+            self._partial[outp] = min(seconds / duration, 0.99)
+            self.report(f"Converting: {os.path.basename(outp)}")
+        return update
 
     def log(self, msg):
         self.log_q.put(msg)
 
-    def run(self):
-        total = len(self.tasks)
-        for idx, (inp, outp) in enumerate(self.tasks, start=1):
-            try:
-                self.progress_cb(idx - 1, total, f"Converting: {os.path.basename(inp)}")
-                if not os.path.isfile(inp):
-                    self.log(f"[SKIP] Not found: {inp}")
-                    continue
+    async def prepare(self, inp):
+        """Probe + auto content detection; returns (info, remux?, content type)."""
+        info = await asyncio.to_thread(probe_media, inp)
+        trimmed = bool(self.trim_start or self.trim_end)
+        remux = (math.isclose(self.speed, 1.0, rel_tol=1e-6) and not self.normalize_audio and not trimmed
+                 and is_ppt_compatible(info, self.profile))
+        content = self.content_type
+        if not remux and content == "Auto" and self.encoder == "libx264":
+            content = await asyncio.to_thread(detect_content_type, inp, self.trim_start)
+            self.log(f"[AUTO] {os.path.basename(inp)}: {content}")
+        return info, remux, content
+
+    async def convert_one(self, inp, outp, lookahead, encode_slots):
+        if not os.path.isfile(inp):
+            self.log(f"[SKIP] Not found: {inp}")
+            return
 
-                os.makedirs(os.path.dirname(outp), exist_ok=True)
-                if os.path.exists(outp) and not self.overwrite:
-                    self.log(f"[SKIP] Exists (enable Overwrite to replace): {outp}")
-                    continue
+        os.makedirs(os.path.dirname(outp), exist_ok=True)
+        if os.path.exists(outp) and not self.overwrite:
+            self.log(f"[SKIP] Exists (enable Overwrite to replace): {outp}")
+            return
+
+        # The lookahead permit is held until an encoder picks this file up, so at most
+        # `jobs` files are probed/sampled ahead of the encodes instead of the whole batch
+        async with lookahead:
+            info, remux, content = await self.prepare(inp)
+            await encode_slots.acquire()
 
-                silent = not has_audio_stream(inp)
+        try:
+            if remux:
+                cmd = build_remux_cmd(inp, outp)
+            else:
+                measured = None
+                if self.normalize_audio and not self.fast_loudness and info["audio"] is not None:
+                    self.log(f"[LOUDNESS] Measuring: {os.path.basename(inp)}")
+                    measured = await asyncio.to_thread(measure_loudness, inp, self.trim_start, self.trim_end)
                 cmd = build_ffmpeg_cmd(
                     inp, outp,
                     profile_cfg=self.profile,
                     speed=self.speed,
                     loud_norm=self.normalize_audio,
-                    add_silence=silent
+                    add_silence=info["audio"] is None,
+                    encoder=self.encoder,
+                    threads=self.threads,
+                    x264_tuning=self.x264_tuning,
+                    fast_loudness=self.fast_loudness,
+                    loud_measured=measured,
+                    width=int((info["video"] or {}).get("width") or 0),
+                    height=int((info["video"] or {}).get("height") or 0),
+                    src_fps=cfr_rate(info["video"]),
+                    tune=CONTENT_TYPES.get(content),
+                    start=self.trim_start,
+                    end=self.trim_end,
+                    tempo=self.tempo
                 )
-                self.log(f"[CMD] {' '.join(cmd)}")
-                code, _, err = run_cmd(cmd)
-                if code != 0:
-                    self.log(f"[ERROR] {os.path.basename(inp)}:\n{err}")
-                else:
-                    self.log(f"[OK] {outp}")
+            self.log(f"[CMD] {' '.join(cmd)}")
+            duration = info["duration"]
+            if duration:
+                duration = max(min(self.trim_end or duration, duration) - (self.trim_start or 0), 0) / self.speed
+            code, _, err = await run_cmd_async(cmd, on_progress=self.file_progress(outp, duration))
+        finally:
+            encode_slots.release()
+        if code != 0:
+            self.log(f"[ERROR] {os.path.basename(inp)}:\n{err}")
+        else:
+            self.log(f"[OK] {outp}")
+
+    async def run_tasks(self):
+        total = len(self.tasks)
+        self.report(f"Converting {total} file(s), {self.jobs} at a time…")
+        encode_slots = asyncio.Semaphore(self.jobs)
+        lookahead = asyncio.Semaphore(self.jobs)
+
+        async def one(inp, outp):
+            try:
+                await self.convert_one(inp, outp, lookahead, encode_slots)
             except Exception as e:
                 self.log(f"[ERROR] {os.path.basename(inp)}: {e}")
             finally:
-                self.progress_cb(idx, total, f"Done {idx}/{total}")
+                self._done += 1
+                self._partial.pop(outp, None)
+                self.report(f"Done {self._done}/{total}")
+
+        await asyncio.gather(*(one(inp, outp) for inp, outp in self.tasks))
+
+    def run(self):
+        asyncio.run(self.run_tasks())
 
 # ----------------------- GUI -----------------------
 
+LOG_MAX_LINES = 5000
+
 class App:
     def __init__(self, root: Tk):
         self.root = root
@@ -209,12 +765,25 @@ class App:
         self._set_style()
 
         self.files = []
+        self._files_set = set()  # O(1) dedup for large drops
         self.out_dir = StringVar(value=os.path.expanduser("~"))
         self.profile = StringVar(value=list(PROFILES.keys())[0])
         self.normalize_audio = BooleanVar(value=False)
+        self.fast_loudness = BooleanVar(value=True)
         self.overwrite = BooleanVar(value=True)
         self.speed_preset = StringVar(value="1.0x")
         self.speed_custom = StringVar(value="1.0")
+        self.encoders = ["libx264"]
+        if which_ffmpeg():
+            self.encoders = detect_h264_encoders()
+            detect_tempo_filters()
+        self.encoder = StringVar(value=self.encoders[0])
+        self.jobs = StringVar(value=str(DEFAULT_JOBS))
+        self.threads = StringVar(value=str(DEFAULT_THREADS))
+        self.x264_tuning = BooleanVar(value=True)
+        self.content_type = StringVar(value="Auto")
+        self.trim_start = StringVar(value="")
+        self.trim_end = StringVar(value="")
 
         self.log_q = queue.Queue()
 
@@ -267,6 +836,9 @@ class App:
         speed_box.grid(column=3, row=0, sticky=(E, W), pady=(0,6))
         speed_box.bind("<<ComboboxSelected>>", self._on_speed_preset)
 
+        ttk.Label(opts, text="Encoder:").grid(column=0, row=1, sticky=W)
+        ttk.Combobox(opts, textvariable=self.encoder, values=self.encoders, state="readonly").grid(column=1, row=1, sticky=(E, W))
+
         self.custom_row = ttk.Frame(opts)
         self.custom_row.grid(column=2, row=1, columnspan=2, sticky=(E, W))
         self.custom_row.columnconfigure(1, weight=1)
@@ -275,8 +847,29 @@ class App:
         self.custom_entry.grid(column=1, row=0, sticky=(E, W))
 
         ttk.Checkbutton(opts, text="Normalize audio loudness", variable=self.normalize_audio).grid(column=0, row=2, sticky=W, pady=(6,0))
+        ttk.Checkbutton(opts, text="Use fast loudness (dynaudnorm); off = EBU R128 two-pass",
+                        variable=self.fast_loudness).grid(column=2, row=2, columnspan=2, sticky=W, pady=(6,0))
         ttk.Checkbutton(opts, text="Overwrite existing files", variable=self.overwrite).grid(column=1, row=2, sticky=W, pady=(6,0))
 
+        ttk.Label(opts, text="Content:").grid(column=0, row=3, sticky=W, pady=(6,0))
+        ttk.Combobox(opts, textvariable=self.content_type, values=list(CONTENT_TYPES.keys()), state="readonly").grid(
+            column=1, row=3, sticky=(E, W), pady=(6,0))
+
+        trim_row = ttk.Frame(opts)
+        trim_row.grid(column=2, row=3, columnspan=2, sticky=(E, W), pady=(6,0))
+        ttk.Label(trim_row, text="Trim start:").grid(column=0, row=0, sticky=W)
+        ttk.Entry(trim_row, textvariable=self.trim_start, width=10).grid(column=1, row=0, sticky=W, padx=(4,8))
+        ttk.Label(trim_row, text="end (HH:MM:SS):").grid(column=2, row=0, sticky=W)
+        ttk.Entry(trim_row, textvariable=self.trim_end, width=10).grid(column=3, row=0, sticky=W, padx=(4,0))
+
+        adv = ttk.LabelFrame(opts, text="Advanced", padding=8)
+        adv.grid(column=0, row=4, columnspan=4, sticky=(E, W), pady=(8,0))
+        ttk.Label(adv, text="Parallel jobs:").grid(column=0, row=0, sticky=W)
+        ttk.Spinbox(adv, textvariable=self.jobs, from_=1, to=CPU_COUNT, width=6).grid(column=1, row=0, sticky=W, padx=(4,12))
+        ttk.Label(adv, text="Threads per job (0 = split cores):").grid(column=2, row=0, sticky=W)
+        ttk.Spinbox(adv, textvariable=self.threads, from_=0, to=CPU_COUNT, width=6).grid(column=3, row=0, sticky=W, padx=(4,12))
+        ttk.Checkbutton(adv, text="x264 thread tuning", variable=self.x264_tuning).grid(column=4, row=0, sticky=W)
+
         # Progress + Action
         action = ttk.Frame(container, padding=(0, 6, 0, 6))
         action.grid(column=0, row=3, sticky=(E, W))
@@ -325,7 +918,6 @@ class App:
         style.configure("Muted.TLabel", foreground="#666")
 
     def _mk_listbox(self, parent, height=10):
-        import tkinter as tk
         frame = ttk.Frame(parent)
         frame.columnconfigure(0, weight=1)
         frame.rowconfigure(0, weight=1)
@@ -337,7 +929,6 @@ class App:
         return lb
 
     def _mk_text(self, parent, height=10):
-        import tkinter as tk
         txt = tk.Text(parent, height=height, wrap="word", relief="flat", highlightthickness=1, highlightbackground="#ddd")
         sb = ttk.Scrollbar(parent, orient="vertical", command=txt.yview)
         txt.configure(yscrollcommand=sb.set)
@@ -361,13 +952,19 @@ class App:
         )
         if not paths:
             return
+        new_paths = []
         for p in paths:
-            if p not in self.files:
-                self.files.append(p)
-                self.file_list.insert("end", p)
+            if p not in self._files_set:
+                self._files_set.add(p)
+                new_paths.append(p)
+        if new_paths:
+            self.files.extend(new_paths)
+            # One Tk call for the whole batch
+            self.file_list.insert("end", *new_paths)
 
     def clear_files(self):
         self.files.clear()
+        self._files_set.clear()
         self.file_list.delete(0, "end")
 
     def pick_out_dir(self):
@@ -382,11 +979,21 @@ class App:
         if not which_ffmpeg():
             messagebox.showerror("Missing ffmpeg", "ffmpeg/ffprobe not found on PATH.")
             return
+        try:
+            start = parse_timestamp(self.trim_start.get())
+            end = parse_timestamp(self.trim_end.get())
+        except ValueError:
+            messagebox.showerror("Invalid trim", "Trim times must look like SS, MM:SS or HH:MM:SS.")
+            return
+        # trim_args treats an end of 0 as "no end", so it would silently keep the whole clip
+        if end is not None and (end <= 0 or (start is not None and end <= start)):
+            messagebox.showerror("Invalid trim", "Trim end must be after the start (and above 0).")
+            return
 
-        tasks = []
-        out_root = self.out_dir.get()
-        for f in self.files:
-            tasks.append((f, suggest_output_path(f, out_root)))
+        tasks = plan_tasks(self.files, self.out_dir.get())
+        for f, outp in tasks:
+            if outp != suggest_output_path(f, self.out_dir.get()):
+                self.log_q.put(f"[RENAME] Output name already used in this batch: {f} -> {outp}")
 
         self.convert_btn.config(state="disabled")
         self.progress.config(value=0, maximum=len(tasks))
@@ -400,7 +1007,15 @@ class App:
             normalize_audio=self.normalize_audio.get(),
             overwrite=self.overwrite.get(),
             log_q=self.log_q,
-            progress_cb=self.update_progress
+            progress_cb=self.update_progress,
+            encoder=self.encoder.get(),
+            jobs=parse_count(self.jobs.get(), DEFAULT_JOBS, minimum=1),
+            threads=parse_count(self.threads.get(), DEFAULT_THREADS),
+            x264_tuning=self.x264_tuning.get(),
+            fast_loudness=self.fast_loudness.get(),
+            content_type=self.content_type.get(),
+            start=start,
+            end=end
         )
         worker.start()
 
@@ -418,13 +1033,19 @@ class App:
         self.status.set(msg)
 
     def drain_log(self):
+        batch = []
         try:
             while True:
-                msg = self.log_q.get_nowait()
-                self.log_box.insert("end", msg + "\n")
-                self.log_box.see("end")
+                batch.append(self.log_q.get_nowait())
         except queue.Empty:
             pass
+        if batch:
+            # One insert per tick, then trim so long batches can't grow the widget forever
+            self.log_box.insert("end", "\n".join(batch) + "\n")
+            lines = int(self.log_box.index("end-1c").split(".")[0])
+            if lines > LOG_MAX_LINES:
+                self.log_box.delete("1.0", f"end-{LOG_MAX_LINES}l")
+            self.log_box.see("end")
         self.root.after(120, self.drain_log)
 
 # ----------------------- Main -----------------------
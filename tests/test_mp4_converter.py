@@ -0,0 +1,257 @@
+import math
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mp4_converter as mc
+
+BASELINE = mc.PROFILES["Most Compatible (Baseline L3.1, 30fps)"]
+
+
+def _factors(expr):
+    return [float(part.split("=")[1]) for part in expr.split(",")]
+
+
+# ---- atempo ----
+
+@pytest.mark.parametrize("speed", [2.5, 3.0, 4.0, 7.3])
+def test_atempo_daisy_chains_above_2x(speed):
+    for expr in (mc.build_atempo_expr(speed), mc.atempo_chain(speed)):
+        factors = _factors(expr)
+        assert len(factors) >= 2
+        assert all(0.5 <= f <= 2.0 for f in factors)
+        assert math.isclose(math.prod(factors), speed, rel_tol=1e-3)
+
+
+@pytest.mark.parametrize("speed", [0.25, 0.5, 0.75, 1.25, 2.0])
+def test_atempo_stays_within_filter_range(speed):
+    factors = _factors(mc.build_atempo_expr(speed))
+    assert all(0.5 <= f <= 2.0 for f in factors)
+    assert math.isclose(math.prod(factors), speed, rel_tol=1e-3)
+
+
+def test_atempo_cache_matches_presets():
+    for preset in mc.SPEED_PRESETS[:-1]:
+        speed = float(preset.rstrip("x"))
+        assert mc._ATEMPO_CACHE[speed] == mc.build_atempo_expr(speed)
+
+
+def test_atempo_cache_does_not_grow_for_custom_speeds():
+    size = len(mc._ATEMPO_CACHE)
+    mc.atempo_chain(1.15)
+    assert len(mc._ATEMPO_CACHE) == size
+
+
+# ---- stream-copy eligibility ----
+
+def _compatible_info(**video):
+    v = {
+        "codec_type": "video", "codec_name": "h264", "profile": "Constrained Baseline",
+        "level": "31", "pix_fmt": "yuv420p", "width": "1280", "height": "720",
+        "r_frame_rate": "30/1", "avg_frame_rate": "30/1", "bit_rate": "2500000",
+    }
+    v.update(video)
+    a = {"codec_type": "audio", "codec_name": "aac", "sample_rate": "48000", "channels": "2"}
+    return {"video": v, "audio": a, "duration": 10.0}
+
+
+def test_is_ppt_compatible_accepts_matching_input():
+    assert mc.is_ppt_compatible(_compatible_info(), BASELINE)
+
+
+@pytest.mark.parametrize("override", [
+    {"codec_name": "hevc"},
+    {"pix_fmt": "yuv444p"},
+    {"profile": "High"},
+    {"level": "40"},
+    {"width": "1281"},
+    {"r_frame_rate": "60/1", "avg_frame_rate": "60/1"},
+    {"avg_frame_rate": "24/1"},        # variable frame rate
+    {"bit_rate": "9000000"},           # above the profile's maxrate
+    {"bit_rate": "N/A"},
+])
+def test_is_ppt_compatible_rejects_mismatches(override):
+    assert not mc.is_ppt_compatible(_compatible_info(**override), BASELINE)
+
+
+def test_is_ppt_compatible_requires_aac_stereo_48k():
+    info = _compatible_info()
+    info["audio"]["sample_rate"] = "44100"
+    assert not mc.is_ppt_compatible(info, BASELINE)
+    info = _compatible_info()
+    info["audio"] = None
+    assert not mc.is_ppt_compatible(info, BASELINE)
+
+
+# ---- even dimensions / fps ----
+
+def test_even_dimensions_filter_full_chain_when_unknown():
+    assert mc.ensure_even_dimensions_filter() == (
+        "scale=trunc(iw/2)*2:trunc(ih/2)*2:flags=bilinear,fps=fps=30:round=near"
+    )
+
+
+def test_even_dimensions_filter_skips_satisfied_steps():
+    assert mc.ensure_even_dimensions_filter(1280, 720, 30.0) == ""
+    assert mc.ensure_even_dimensions_filter(1280, 720, 25.0) == "fps=fps=30:round=near"
+    assert mc.ensure_even_dimensions_filter(1281, 720, 30.0).startswith("scale=")
+
+
+def test_build_cmd_omits_vf_when_nothing_to_filter():
+    cmd = mc.build_ffmpeg_cmd("in.mov", "out.mp4", BASELINE, width=1280, height=720, src_fps=30.0)
+    assert "-vf" not in cmd
+
+
+@pytest.mark.parametrize("encoder", ["libx264", "h264_nvenc", "h264_qsv", "h264_vaapi"])
+def test_encoders_cap_bitrate_at_profile_maxrate(encoder):
+    _, _, args = mc.video_codec_args(encoder, BASELINE)
+    assert args[args.index("-maxrate") + 1] == BASELINE["maxrate"]
+    assert args[args.index("-bufsize") + 1] == BASELINE["bufsize"]
+
+
+def test_videotoolbox_targets_profile_maxrate():
+    high = mc.PROFILES["High Quality (High L4.1, 30fps)"]
+    _, _, args = mc.video_codec_args("h264_videotoolbox", high)
+    assert args[args.index("-b:v") + 1] == high["maxrate"]
+
+# ---- trim timestamps ----
+
+@pytest.mark.parametrize("text,seconds", [
+    ("90", 90.0),
+    ("1:30", 90.0),
+    ("01:02:03.5", 3723.5),
+    ("0", 0.0),
+])
+def test_parse_timestamp_valid(text, seconds):
+    assert mc.parse_timestamp(text) == seconds
+
+
+def test_parse_timestamp_blank_is_none():
+    assert mc.parse_timestamp("  ") is None
+
+
+@pytest.mark.parametrize("text", ["1:-30", "-5", "nan", "inf", "1:60", "1:75:00", "1:2:3:4", "abc", "1::2"])
+def test_parse_timestamp_rejects_invalid(text):
+    with pytest.raises(ValueError):
+        mc.parse_timestamp(text)
+
+
+# ---- output planning ----
+
+def test_plan_tasks_gives_case_insensitive_duplicates_distinct_outputs():
+    out = "out"
+    files = [os.path.join("a", "Clip.mov"), os.path.join("b", "clip.mp4"),
+             os.path.join("c", "clip.mkv"), os.path.join("d", "CLIP.avi"), os.path.join("e", "other.mov")]
+    tasks = mc.plan_tasks(files, out)
+    assert [inp for inp, _ in tasks] == files
+    assert [outp for _, outp in tasks] == [
+        os.path.join(out, "Clip_ppt.mp4"),
+        os.path.join(out, "clip_ppt_2.mp4"),
+        os.path.join(out, "clip_ppt_3.mp4"),
+        os.path.join(out, "CLIP_ppt_4.mp4"),
+        os.path.join(out, "other_ppt.mp4"),
+    ]
+
+
+# ---- loudness ----
+
+# loudnorm's print_format=json output for a silent input
+SILENT_LOUDNORM = """[Parsed_loudnorm_0 @ 0x55d0c8a3c0c0]
+{
+	"input_i" : "-inf",
+	"input_tp" : "-inf",
+	"input_lra" : "0.00",
+	"input_thresh" : "-inf",
+	"output_i" : "-inf",
+	"output_tp" : "-inf",
+	"output_lra" : "0.00",
+	"output_thresh" : "-inf",
+	"normalization_type" : "dynamic",
+	"target_offset" : "inf"
+}
+"""
+
+
+def test_measure_loudness_rejects_inf_and_falls_back_to_single_pass(monkeypatch):
+    monkeypatch.setattr(mc, "run_cmd", lambda cmd, **kw: (0, "", SILENT_LOUDNORM))
+    measured = mc.measure_loudness("silent.mov")
+    assert measured is None
+    assert mc.loudness_filter(fast=False, measured=measured) == f"loudnorm={mc.LOUDNORM_TARGET}"
+
+
+def test_loudness_filter_uses_valid_measurements_for_linear_pass():
+    measured = {"input_i": "-27.61", "input_tp": "-4.47", "input_lra": "18.06",
+                "input_thresh": "-39.20", "target_offset": "0.58"}
+    assert mc.loudness_filter(fast=False, measured=measured) == (
+        f"loudnorm={mc.LOUDNORM_TARGET}:measured_I=-27.61:measured_TP=-4.47"
+        ":measured_LRA=18.06:measured_thresh=-39.2:offset=0.58:linear=true"
+    )
+    measured["input_thresh"] = "-120.0"
+    assert mc.loudness_filter(fast=False, measured=measured) == f"loudnorm={mc.LOUDNORM_TARGET}"
+
+
+# ---- probe ----
+
+# ffprobe -of flat output: audio first, an attached cover picture after the main video
+FLAT_PROBE = """streams.stream.0.codec_name="aac"
+streams.stream.0.profile="LC"
+streams.stream.0.codec_type="audio"
+streams.stream.0.sample_rate="44100"
+streams.stream.0.channels=2
+streams.stream.0.bit_rate="128000"
+streams.stream.1.codec_name="h264"
+streams.stream.1.profile="Constrained Baseline"
+streams.stream.1.codec_type="video"
+streams.stream.1.width=1280
+streams.stream.1.height=720
+streams.stream.1.pix_fmt="yuv420p"
+streams.stream.1.level=31
+streams.stream.1.r_frame_rate="30/1"
+streams.stream.1.avg_frame_rate="30/1"
+streams.stream.1.bit_rate="N/A"
+streams.stream.2.codec_name="mjpeg"
+streams.stream.2.profile="Baseline"
+streams.stream.2.codec_type="video"
+streams.stream.2.width=600
+streams.stream.2.height=600
+format.duration="N/A"
+"""
+
+
+def _fake_ffprobe(monkeypatch, code, out):
+    monkeypatch.setattr(mc, "_load_av", lambda: None)
+    monkeypatch.setattr(mc, "run_cmd", lambda cmd, **kw: (code, out, ""))
+
+
+def test_probe_media_parses_flat_output(monkeypatch):
+    _fake_ffprobe(monkeypatch, 0, FLAT_PROBE)
+    info = mc.probe_media("clip.mkv")
+    assert info["audio"] == {
+        "codec_name": "aac", "profile": "LC", "codec_type": "audio",
+        "sample_rate": "44100", "channels": "2", "bit_rate": "128000",
+    }
+    v = info["video"]
+    assert v["codec_name"] == "h264"
+    assert v["profile"] == "Constrained Baseline"
+    assert (v["width"], v["height"], v["level"]) == ("1280", "720", "31")
+    assert v["bit_rate"] == "N/A"
+    assert mc.parse_bitrate(v["bit_rate"]) == 0
+    assert info["duration"] is None
+
+
+def test_probe_media_reads_duration(monkeypatch):
+    _fake_ffprobe(monkeypatch, 0, FLAT_PROBE.replace('format.duration="N/A"', 'format.duration="12.345000"'))
+    assert mc.probe_media("clip.mkv")["duration"] == 12.345
+
+
+def test_pyav_is_imported_lazily():
+    assert "av" not in vars(mc)
+    assert mc._load_av() is mc._load_av()
+
+
+def test_probe_media_failed_ffprobe_returns_empty_info(monkeypatch):
+    _fake_ffprobe(monkeypatch, 1, FLAT_PROBE)
+    assert mc.probe_media("missing.mov") == {"video": None, "audio": None, "duration": None}